@@ -0,0 +1,117 @@
+"""
+This module contains the helpers shared by the Radarr and Sonarr scripts
+for fetching data from the *arr v3 API and saving it to files.
+"""
+
+import contextlib
+import gzip
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import env
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_ADAPTER = HTTPAdapter(
+    pool_connections=2,  # One pool each for Radarr and Sonarr
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)
+    ),
+)
+_SESSION = requests.Session()  # Reused across Radarr and Sonarr calls
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+def fetch(api_key: str, base_url: str, endpoint: str) -> list[dict]:
+    """
+    Get a list resource from a Radarr or Sonarr API.
+
+    Args:
+        api_key (str): The API key.
+        base_url (str): The base URL of the API.
+        endpoint (str): The v3 resource to fetch, e.g. "movie" or "series".
+
+    Returns:
+        list: A list of items, empty if the request failed.
+    """
+    headers = {"X-Api-Key": api_key}
+    url = f"{base_url}/api/v3/{endpoint}"
+
+    try:
+        response: requests.Response = _SESSION.get(
+            url, headers=headers, timeout=10
+        )
+        response.raise_for_status()
+        items: list[dict] = (
+            orjson.loads(response.content) if orjson else response.json()
+        )
+        return items
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error: {e}")
+        return []
+
+
+def write_json(items: list[dict], filename: str) -> str:
+    """
+    Write a list of items to a JSON file.
+
+    The output is minified but still valid JSON, unless the PRETTY_JSON
+    environment variable is set. If COMPRESS_OUTPUT is set, the file is
+    gzipped at the fastest compression level and ".gz" is appended to its
+    name.
+
+    Args:
+        items (list): The list of items to save.
+        filename (str): The name of the output JSON file.
+
+    Returns:
+        str: The name of the file that was written.
+    """
+    pretty = bool(env().get("PRETTY_JSON"))
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        data: bytes = orjson.dumps(items, option=option)
+    else:
+        data = json.dumps(
+            items,
+            indent=2 if pretty else None,
+            separators=None if pretty else (",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+    if env().get("COMPRESS_OUTPUT"):
+        filename += ".gz"
+        data = gzip.compress(data, compresslevel=1)
+    write_file(data, filename)
+    return filename
+
+
+def write_file(data: bytes, filename: str):
+    """
+    Write data to a file atomically.
+
+    The data is written to "<filename>.tmp" first, which then replaces the
+    file in a single rename, so readers never see a partial file.
+
+    Args:
+        data (bytes): The content to write.
+        filename (str): The name of the output file.
+    """
+    tmp_filename = f"{filename}.tmp"
+    try:
+        with open(tmp_filename, "wb") as file:
+            file.write(data)
+        os.replace(tmp_filename, filename)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_filename)
+        raise
@@ -0,0 +1,22 @@
+"""
+This module loads the environment shared by the Radarr and Sonarr scripts.
+"""
+
+import functools
+import os
+import types
+from collections.abc import Mapping
+
+from dotenv import load_dotenv
+
+
+@functools.cache
+def env() -> Mapping[str, str]:
+    """
+    Get the environment, loading .env on the first call only.
+
+    Returns:
+        Mapping: A read-only snapshot of the environment variables.
+    """
+    load_dotenv()  # Load environment variables from .env
+    return types.MappingProxyType(dict(os.environ))
@@ -4,14 +4,12 @@ and saving it to a JSON file.
 """
 
 import csv
-import json
-import os
+import io
+from collections.abc import Iterable
+from operator import itemgetter
 
-import requests
-from dotenv import load_dotenv
-
-
-load_dotenv()  # Load environment variables from .env
+from common import fetch, write_file, write_json
+from config import env
 
 
 def get_movie_list(api_key: str, base_url: str) -> list[dict]:
@@ -25,59 +23,53 @@ def get_movie_list(api_key: str, base_url: str) -> list[dict]:
     Returns:
         list: A list of movies.
     """
-    headers = {"X-Api-Key": api_key}
-    url = f"{base_url}/api/v3/movie"
-
-    try:
-        response: requests.Response = requests.get(
-            url, headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        movies: list[dict] = response.json()
-        return movies
-    except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
-        return []
+    return fetch(api_key, base_url, "movie")
 
 
 def save_movies_to_file(movies: list[dict], filename: str = "movie_list.json"):
     """
     Save the list of movies to a JSON file.
 
+    The output is compact unless the PRETTY_JSON environment variable is
+    set, and gzipped to "<filename>.gz" if COMPRESS_OUTPUT is set.
+
     Args:
         movies (list): The list of movies to save.
         filename (str, optional): The name of the output JSON file.
         Defaults to "movie_list.json".
     """
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(movies, file, indent=4)
-    print(f"{len(movies)} movies exported to {filename}")
+    path = write_json(movies, filename)
+    print(f"{len(movies)} movies exported to {path}")
 
 
-def write_movies_to_csv(movies: list[dict], filename: str = "movie_list.csv"):
+def write_movies_to_csv(
+    movies: Iterable[dict], filename: str = "movie_list.csv"
+):
     """
     Parse the movie list and write it to a CSV file.
 
     Args:
-        movies (list): The list of movies to parse and write.
+        movies (iterable): The movies to parse and write.
         filename (str, optional): The name of the output CSV file.
         Defaults to "movie_list.csv".
     """
-    with open(filename, "w", newline="", encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Title", "Year", "TMDB ID"])
-        sorted_movies = sorted(movies, key=lambda x: x["title"])
-        for movie in sorted_movies:
-            writer.writerow([movie["title"], movie["year"], movie["tmdbId"]])
-    print(f"{len(movies)} movies exported to {filename}")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Title", "Year", "TMDB ID"])
+    rows = sorted(
+        map(itemgetter("title", "year", "tmdbId"), movies), key=itemgetter(0)
+    )
+    writer.writerows(rows)
+    write_file(buffer.getvalue().encode("utf-8"), filename)
+    print(f"{len(rows)} movies exported to {filename}")
 
 
 def main():
     """
     Main function to fetch movie list, save to JSON, and parse to CSV.
     """
-    api_key = os.getenv("RADARR_API_KEY")  # Environment variable
-    base_url = os.getenv("RADARR_BASE_URL")  # Environment variable
+    api_key = env().get("RADARR_API_KEY")  # Environment variable
+    base_url = env().get("RADARR_BASE_URL")  # Environment variable
     if api_key and base_url:
         movies: list[dict] = get_movie_list(api_key, base_url)
         if movies:
@@ -4,14 +4,12 @@ and saving it to a JSON file.
 """
 
 import csv
-import json
-import os
+import io
+from collections.abc import Iterable
+from operator import itemgetter
 
-import requests
-from dotenv import load_dotenv
-
-
-load_dotenv()  # Load environment variables from .env
+from common import fetch, write_file, write_json
+from config import env
 
 
 def get_show_list(api_key: str, base_url: str) -> list[dict]:
@@ -25,57 +23,53 @@ def get_show_list(api_key: str, base_url: str) -> list[dict]:
     Returns:
         list: A list of TV shows.
     """
-    headers = {"X-Api-Key": api_key}
-    url = f"{base_url}/api/v3/series"
-
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        shows: list[dict] = response.json()
-        return shows
-    except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
-        return []
+    return fetch(api_key, base_url, "series")
 
 
 def save_shows_to_file(shows: list[dict], filename: str = "show_list.json"):
     """
     Save the list of TV shows to a JSON file.
 
+    The output is compact unless the PRETTY_JSON environment variable is
+    set, and gzipped to "<filename>.gz" if COMPRESS_OUTPUT is set.
+
     Args:
         shows (list): The list of TV shows to save.
         filename (str, optional): The name of the output file.
         Defaults to "show_list.json".
     """
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(shows, file, indent=4)
-    print(f"{len(shows)} shows exported to {filename}")
+    path = write_json(shows, filename)
+    print(f"{len(shows)} shows exported to {path}")
 
 
-def write_shows_to_csv(shows: list[dict], filename: str = "show_list.csv"):
+def write_shows_to_csv(
+    shows: Iterable[dict], filename: str = "show_list.csv"
+):
     """
     Parse the TV show list and write it to a CSV file.
 
     Args:
-        shows (list): The list of TV shows to parse and write.
+        shows (iterable): The TV shows to parse and write.
         filename (str, optional): The name of the output CSV file.
         Defaults to "show_list.csv".
     """
-    with open(filename, "w", newline="", encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Title", "Year", "TVDB ID"])
-        sorted_shows = sorted(shows, key=lambda x: x["title"])
-        for show in sorted_shows:
-            writer.writerow([show["title"], show["year"], show["tvdbId"]])
-    print(f"{len(shows)} shows exported to {filename}")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Title", "Year", "TVDB ID"])
+    rows = sorted(
+        map(itemgetter("title", "year", "tvdbId"), shows), key=itemgetter(0)
+    )
+    writer.writerows(rows)
+    write_file(buffer.getvalue().encode("utf-8"), filename)
+    print(f"{len(rows)} shows exported to {filename}")
 
 
 def main():
     """
     Main function to fetch TV show list, save to JSON, and parse to CSV.
     """
-    api_key = os.getenv("SONARR_API_KEY")  # Environment variable
-    base_url = os.getenv("SONARR_BASE_URL")  # Environment variable
+    api_key = env().get("SONARR_API_KEY")  # Environment variable
+    base_url = env().get("SONARR_BASE_URL")  # Environment variable
     if api_key and base_url:
         shows: list[dict] = get_show_list(api_key, base_url)
         if shows:
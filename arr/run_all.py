@@ -0,0 +1,47 @@
+"""
+This module fetches the movie list from Radarr and the TV show list from
+Sonarr concurrently, and saves both to JSON and CSV files.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from config import env
+from get_movies import get_movie_list, save_movies_to_file, write_movies_to_csv
+from get_tvshows import get_show_list, save_shows_to_file, write_shows_to_csv
+
+
+def main():
+    """
+    Main function to fetch both lists in parallel, then save them to JSON
+    and parse them to CSV.
+    """
+    radarr = (env().get("RADARR_API_KEY"), env().get("RADARR_BASE_URL"))
+    sonarr = (env().get("SONARR_API_KEY"), env().get("SONARR_BASE_URL"))
+    if not (all(radarr) and all(sonarr)):
+        print("API key or base URL not found")
+        return
+
+    # The requests block on socket I/O, which releases the GIL
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        movies_future = executor.submit(get_movie_list, *radarr)
+        shows_future = executor.submit(get_show_list, *sonarr)
+        movies: list[dict] = movies_future.result()
+        shows: list[dict] = shows_future.result()
+
+        jobs = []
+        if movies:
+            jobs.append(executor.submit(save_movies_to_file, movies))
+            jobs.append(executor.submit(write_movies_to_csv, movies))
+        else:
+            print("No movies found")
+        if shows:
+            jobs.append(executor.submit(save_shows_to_file, shows))
+            jobs.append(executor.submit(write_shows_to_csv, shows))
+        else:
+            print("No TV shows found")
+        for job in jobs:
+            job.result()
+
+
+if __name__ == "__main__":
+    main()